@@ -1,12 +1,27 @@
 import math
+import os
 import sys
+from collections import OrderedDict
 import pygame
+import pygame.gfxdraw
+import numpy as np
+
+# Numba is opt-in (SPHERE_NAV_NUMBA=1). The batch helpers only run once, for the
+# startup wireframe draw, so at the default density importing numba costs more
+# launch time than the kernels save.
+njit = None
+if os.environ.get("SPHERE_NAV_NUMBA") == "1":
+    try:
+        from numba import njit
+    except ImportError:  # the numpy versions below are used instead
+        pass
 
 # =========================
 # Config
 # =========================
 WIDTH, HEIGHT = 1000, 700
 FPS = 60
+IDLE_WAIT_MS = 100           # max sleep per loop while no movement keys are held
 
 RADIUS = 2.0                 # Sphere radius in world units
 CAM_DIST = 8.0               # Camera distance on +Z axis (must be > RADIUS)
@@ -17,7 +32,7 @@ CIRCLE_RES = 64              # resolution per circle polyline
 
 AXIS_LEN = 3.0               # length of axis lines
 POINT_SIZE = 8               # screen pixels
-STEP_COARSE = math.radians(6)
+STEP_COARSE = math.radians(6)   # per frame at FPS; scaled by the real frame time
 STEP_FINE = math.radians(1.5)
 
 BG_COLOR = (14, 18, 24)
@@ -32,81 +47,147 @@ TEXT_COLOR = (210, 220, 230)
 # Math helpers
 # =========================
 
-def sph_to_cart(theta, phi, r=1.0):
+def sph_to_cart_batch(theta, phi, r=1.0):
     """
-    Spherical to Cartesian.
+    Spherical to Cartesian, vectorized.
     theta: polar angle from +Z axis (0 at +Z, pi at -Z)
     phi: azimuth from +X toward +Y around +Z
+    theta and phi are broadcast against each other; returns an array of shape (..., 3).
+    Trig is evaluated on the inputs before broadcasting, so a grid built from
+    a column of thetas and a row of phis costs one sin/cos per grid value.
     """
-    st, ct = math.sin(theta), math.cos(theta)
-    cp, sp = math.cos(phi), math.sin(phi)
-    x = r * st * cp
-    y = r * st * sp
-    z = r * ct
-    return x, y, z
-
-def cart_to_sph(x, y, z):
-    r = math.sqrt(x*x + y*y + z*z)
-    if r == 0:
-        return 0.0, 0.0, 0.0
-    theta = math.acos(z / r)               # [0, pi]
-    phi = math.atan2(y, x)                 # (-pi, pi]
-    return theta, phi, r
-
-def project_point(x, y, z, cx, cy):
+    theta, phi = np.asarray(theta, dtype=float), np.asarray(phi, dtype=float)
+    st, ct = np.sin(theta), np.cos(theta)
+    sp, cp = np.sin(phi), np.cos(phi)
+    x, y, z = np.broadcast_arrays(r * st * cp, r * st * sp, r * ct * np.ones_like(phi))
+    return np.stack((x, y, z), axis=-1)
+
+def project_points(x, y, z, cx, cy):
     """
     Simple pinhole projection from camera at (0,0,CAM_DIST), looking toward origin.
-    Screen center (cx, cy). Returns (sx, sy) or None if behind the camera.
+    x, y, z are parallel (N,) coordinate arrays, screen center (cx, cy).
+    Returns ((N,2) int32 screen coords, (N,) bool mask of points in front of the camera).
     """
     denom = CAM_DIST - z
-    if denom <= 1e-6:
-        return None
-    sx = cx + FOCAL * (x / denom)
-    sy = cy - FOCAL * (y / denom)
-    return (int(sx), int(sy))
-
-def clamp_hemisphere(p, hemi):
+    valid = denom > 1e-6
+    inv = np.divide(1.0, denom, out=np.zeros_like(denom), where=valid)
+    sx = cx + FOCAL * x * inv
+    sy = cy - FOCAL * y * inv
+    return np.stack((sx, sy), axis=1).astype(np.int32), valid
+
+if njit is not None:
+    # Native-code versions of the batch helpers, with the same signatures and
+    # results as the numpy versions above (no fastmath, so the pixels match).
+    # They only run for the startup wireframe draw, so this trades numba's
+    # import and cache-load time at launch for a faster first frame.
+
+    @njit(cache=True)
+    def _sph_to_cart_kernel(theta, phi, r, out):
+        # theta and phi are 2-D and broadcast to out.shape[:2]; trig is taken
+        # once per input value, then combined per grid cell
+        st, ct = np.sin(theta), np.cos(theta)
+        sp, cp = np.sin(phi), np.cos(phi)
+        for i in range(out.shape[0]):
+            ti = i if theta.shape[0] > 1 else 0
+            pi_ = i if phi.shape[0] > 1 else 0
+            for j in range(out.shape[1]):
+                tj = j if theta.shape[1] > 1 else 0
+                pj = j if phi.shape[1] > 1 else 0
+                out[i, j, 0] = r * st[ti, tj] * cp[pi_, pj]
+                out[i, j, 1] = r * st[ti, tj] * sp[pi_, pj]
+                out[i, j, 2] = r * ct[ti, tj]
+
+    _sph_to_cart_batch_np = sph_to_cart_batch
+
+    def sph_to_cart_batch(theta, phi, r=1.0):
+        shape = np.broadcast_shapes(np.shape(theta), np.shape(phi))
+        if len(shape) > 2:
+            return _sph_to_cart_batch_np(theta, phi, r)
+        theta = np.atleast_2d(np.asarray(theta, dtype=float))
+        phi = np.atleast_2d(np.asarray(phi, dtype=float))
+        out = np.empty(np.broadcast_shapes(theta.shape, phi.shape) + (3,))
+        _sph_to_cart_kernel(theta, phi, float(r), out)
+        return out.reshape(shape + (3,))
+
+    @njit(cache=True)
+    def project_points(x, y, z, cx, cy):
+        # same float32 arithmetic, in the same order, as the numpy version
+        n = z.shape[0]
+        out = np.empty((n, 2), np.int32)
+        valid = np.empty(n, np.bool_)
+        cam, focal = np.float32(CAM_DIST), np.float32(FOCAL)
+        fcx, fcy = np.float32(cx), np.float32(cy)
+        for i in range(n):
+            denom = cam - z[i]
+            valid[i] = denom > 1e-6
+            inv = np.float32(1.0) / denom if valid[i] else np.float32(0.0)
+            out[i, 0] = np.int32(fcx + focal * x[i] * inv)
+            out[i, 1] = np.int32(fcy - focal * y[i] * inv)
+        return out, valid
+
+# Hemisphere name -> (axis index, sign) of the component that must stay non-negative
+HEMI = {
+    None: None,
+    '+X': (0, 1), '-X': (0, -1),
+    '+Y': (1, 1), '-Y': (1, -1),
+    '+Z': (2, 1), '-Z': (2, -1),
+}
+
+def clamp_hemisphere(p, k):
     """
     Enforce hemisphere constraint.
-    hemi is one of: None, '+X','-X','+Y','-Y','+Z','-Z'
-    Returns a vector on/inside hemisphere (by rejecting illegal moves).
+    k is an entry of HEMI: None (free) or (axis, sign).
+    Returns whether p lies on/inside the hemisphere.
     Here we choose 'reject' approach: we don't alter p; caller decides.
     """
-    if hemi is None:
-        return True
-    x, y, z = p
-    if hemi == '+X': return x >= -1e-9
-    if hemi == '-X': return x <= +1e-9
-    if hemi == '+Y': return y >= -1e-9
-    if hemi == '-Y': return y <= +1e-9
-    if hemi == '+Z': return z >= -1e-9
-    if hemi == '-Z': return z <= +1e-9
-    return True
-
-def try_move(theta, phi, dtheta, dphi, hemi):
-    """Attempt to update (theta,phi) by deltas while honoring hemisphere constraint."""
-    nt = theta + dtheta
-    np_ = phi + dphi
-    # wrap ranges
-    # theta in [0, pi]
-    nt = max(0.0, min(math.pi, nt))
-    # phi wrap (-pi, pi] for readability
-    np_ = (np_ + math.pi) % (2*math.pi) - math.pi
-
-    x, y, z = sph_to_cart(nt, np_, 1.0)
-    if clamp_hemisphere((x, y, z), hemi):
-        return nt, np_
+    return k is None or p[k[0]] * k[1] >= -1e-9
+
+def normalize(v):
+    x, y, z = v
+    inv = 1.0 / math.sqrt(x*x + y*y + z*z)
+    return x*inv, y*inv, z*inv
+
+def rotation_matrix(axis, angle):
+    """Rotation by angle (right-handed) about a unit axis, as a tuple of rows."""
+    x, y, z = axis
+    s, c = math.sin(angle), math.cos(angle)
+    t = 1.0 - c
+    return (
+        (t*x*x + c,   t*x*y - s*z, t*x*z + s*y),
+        (t*x*y + s*z, t*y*y + c,   t*y*z - s*x),
+        (t*x*z - s*y, t*y*z + s*x, t*z*z + c),
+    )
+
+def mat_vec(m, v):
+    x, y, z = v
+    return tuple(r[0]*x + r[1]*y + r[2]*z for r in m)
+
+def try_move(u, east, dtheta, dphi, hemi_key):
+    """
+    Attempt to move the unit direction u by (dtheta, dphi) while honoring hemisphere constraint.
+    dphi rotates about +Z (azimuth); dtheta rotates about east, a horizontal unit
+    tangent at u that is carried along with u so the move stays well defined at
+    and across the poles. It starts as (-sin(phi), cos(phi), 0); each pole crossing
+    negates it relative to that, after which positive dtheta decreases theta, i.e.
+    Up/Down reverse their direction in theta.
+    Returns the new (u, east).
+    """
+    rz = rotation_matrix((0.0, 0.0, 1.0), dphi)
+    u_phi = mat_vec(rz, u)
+    e_phi = normalize(mat_vec(rz, east))
+    nu = normalize(mat_vec(rotation_matrix(e_phi, dtheta), u_phi))
+    if clamp_hemisphere(nu, hemi_key):
+        return nu, e_phi
     # If blocked, allow sliding by zeroing one component at a time
     # Try only dphi
-    x2, y2, z2 = sph_to_cart(theta, np_, 1.0)
-    if clamp_hemisphere((x2, y2, z2), hemi):
-        return theta, np_
+    if clamp_hemisphere(u_phi, hemi_key):
+        return normalize(u_phi), e_phi
     # Try only dtheta
-    x3, y3, z3 = sph_to_cart(nt, phi, 1.0)
-    if clamp_hemisphere((x3, y3, z3), hemi):
-        return nt, phi
+    u_theta = normalize(mat_vec(rotation_matrix(east, dtheta), u))
+    if clamp_hemisphere(u_theta, hemi_key):
+        return u_theta, east
     # Otherwise stay put
-    return theta, phi
+    return u, east
 
 # =========================
 # Drawing helpers
@@ -120,49 +201,86 @@ def draw_axes(screen, cx, cy):
         ((0, 0, -AXIS_LEN), (0, 0,  AXIS_LEN), AXIS_Z_COLOR),
     ]
     for (x1,y1,z1), (x2,y2,z2), color in axes:
-        p1 = project_point(x1,y1,z1,cx,cy)
-        p2 = project_point(x2,y2,z2,cx,cy)
-        if p1 and p2:
-            pygame.draw.line(screen, color, p1, p2, 2)
+        # pinhole projection inlined; six endpoints don't merit project_points
+        d1 = CAM_DIST - z1
+        d2 = CAM_DIST - z2
+        if d1 <= 1e-6 or d2 <= 1e-6:
+            continue
+        p1 = (int(cx + FOCAL * (x1 / d1)), int(cy - FOCAL * (y1 / d1)))
+        p2 = (int(cx + FOCAL * (x2 / d2)), int(cy - FOCAL * (y2 / d2)))
+        pygame.draw.line(screen, color, p1, p2, 2)
+
+def _build_wire_verts():
+    """
+    Wireframe geometry in world space. The camera is fixed, so this is built
+    once. Returns the vertex buffer holding every polyline back to back, as
+    three parallel float32 (N,) arrays (x, y, z), and a (start, end, closed)
+    entry per polyline within it.
+    """
+    lines = []
+
+    # Latitude lines (theta constant), closed circles
+    theta = np.pi * np.arange(1, LAT_LINES) / LAT_LINES
+    phi = np.linspace(0.0, 2*np.pi, CIRCLE_RES, endpoint=False)
+    lines += [(v, True) for v in sph_to_cart_batch(theta[:, None], phi, RADIUS)]
+
+    # Longitude lines (phi constant). Opposite meridians join into one closed
+    # great circle; with an odd count they stay open half circles.
+    if LON_LINES % 2 == 0:
+        phi = 2*np.pi * np.arange(LON_LINES // 2) / LON_LINES
+        theta = np.linspace(0.0, 2*np.pi, 2*CIRCLE_RES, endpoint=False)
+        lines += [(v, True) for v in sph_to_cart_batch(theta, phi[:, None], RADIUS)]
+    else:
+        phi = 2*np.pi * np.arange(LON_LINES) / LON_LINES
+        theta = np.linspace(0.0, np.pi, CIRCLE_RES+1)
+        lines += [(v, False) for v in sph_to_cart_batch(theta, phi[:, None], RADIUS)]
+
+    ranges = []
+    start = 0
+    for v, closed in lines:
+        ranges.append((start, start + len(v), closed))
+        start += len(v)
+    verts = np.concatenate([v for v, _ in lines])
+    # Structure of arrays: each projection ufunc streams one contiguous column
+    wx, wy, wz = (np.ascontiguousarray(verts[:, i], dtype=np.float32) for i in range(3))
+    return (wx, wy, wz), ranges
+
+(_WX, _WY, _WZ), _WIRE_INDEX_RANGES = _build_wire_verts()
 
 def draw_wire_sphere(screen, cx, cy):
-    # Latitude lines (theta constant)
-    for i in range(1, LAT_LINES):
-        theta = math.pi * i / LAT_LINES
-        pts = []
-        for j in range(CIRCLE_RES+1):
-            phi = 2*math.pi * j / CIRCLE_RES
-            x, y, z = sph_to_cart(theta, phi, RADIUS)
-            sp = project_point(x, y, z, cx, cy)
-            if sp:
-                pts.append(sp)
-        if len(pts) >= 2:
-            pygame.draw.lines(screen, WIRE_COLOR, False, pts, 1)
-
-    # Longitude lines (phi constant)
-    for i in range(LON_LINES):
-        phi = 2*math.pi * i / LON_LINES
-        pts = []
-        for j in range(CIRCLE_RES+1):
-            theta = math.pi * j / CIRCLE_RES
-            x, y, z = sph_to_cart(theta, phi, RADIUS)
-            sp = project_point(x, y, z, cx, cy)
-            if sp:
-                pts.append(sp)
-        if len(pts) >= 2:
-            pygame.draw.lines(screen, WIRE_COLOR, False, pts, 1)
+    pts, valid = project_points(_WX, _WY, _WZ, cx, cy)
+    for s, e, closed in _WIRE_INDEX_RANGES:
+        if closed and valid[s:e].all():
+            pygame.gfxdraw.aapolygon(screen, pts[s:e].tolist(), WIRE_COLOR)
+            continue
+        line = pts[s:e][valid[s:e]]
+        if len(line) >= 2:
+            pygame.draw.aalines(screen, WIRE_COLOR, False, line.tolist())
 
 def draw_point_and_radius(screen, cx, cy, p):
+    # pinhole projection inlined; the origin always lands on the screen center
     x, y, z = p
-    # draw radius line from center to point
-    origin = project_point(0,0,0,cx,cy)
-    tip = project_point(x, y, z, cx, cy)
-    if origin and tip:
-        pygame.draw.line(screen, POINT_COLOR, origin, tip, 2)
-        pygame.draw.circle(screen, POINT_COLOR, tip, POINT_SIZE)
+    denom = CAM_DIST - z
+    if denom <= 1e-6:
+        return None
+    tip = (int(cx + FOCAL * (x / denom)), int(cy - FOCAL * (y / denom)))
+    # draw radius line from center to point; returns the touched Rect
+    rect = pygame.draw.line(screen, POINT_COLOR, (cx, cy), tip, 2)
+    return rect.union(pygame.draw.circle(screen, POINT_COLOR, tip, POINT_SIZE))
+
+TEXT_CACHE_SIZE = 64
+_text_cache = OrderedDict()   # (font, string) -> rendered Surface, LRU order
 
 def text(screen, font, s, x, y):
-    img = font.render(s, True, TEXT_COLOR)
+    key = (font, s)
+    img = _text_cache.get(key)
+    if img is None:
+        img = font.render(s, True, TEXT_COLOR)
+        _text_cache[key] = img
+        if len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
     screen.blit(img, (x, y))
 
 def format_vec(v):
@@ -182,26 +300,76 @@ def main():
 
     cx, cy = WIDTH // 2, HEIGHT // 2
 
-    # Start at +X pole (theta=pi/2, phi=0)
-    theta = math.pi / 2
-    phi = 0.0
+    # The camera is fixed, so the wireframe and axes rasterize to the same pixels
+    # every frame: draw them once into a background layer and blit the result.
+    # Drawn over the background color so the anti-aliased edges blend correctly.
+    bg_surf = pygame.Surface((WIDTH, HEIGHT))
+    bg_surf.fill(BG_COLOR)
+    draw_wire_sphere(bg_surf, cx, cy)
+    draw_axes(bg_surf, cx, cy)
+
+    # Dirty rects: after the first full frame, a redraw restores the previous
+    # point's rect from bg_surf, draws the new point straight onto the screen and
+    # pushes only the touched rects to the display.
+    full_redraw = True
+    point_rect = None
+
+    # Start at +X pole (theta=pi/2, phi=0); east is the tangent that Up/Down rotate about
+    u = (1.0, 0.0, 0.0)
+    east = (0.0, 1.0, 0.0)
 
     hemisphere = None  # None, '+X','-X','+Y','-Y','+Z','-Z'
+    hemi_key = HEMI[hemisphere]
+
+    # The frame only changes with the point or the constraint; skip redraws otherwise
+    dirty = True
+    # With no movement keys held the loop has nothing to animate and can block on input
+    idle = False
+    # Movement/modifier keys currently held, tracked from KEYDOWN/KEYUP events
+    held = dict.fromkeys((pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+                          pygame.K_LSHIFT, pygame.K_RSHIFT), False)
+    # HUD readouts at display precision, and the text layer (rows y=16..120) composed from them
+    hud_state = None
+    hud_surf = pygame.Surface((WIDTH, 150), pygame.SRCALPHA)
+    hud_rect = hud_surf.get_rect()
 
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000.0
-
-        for event in pygame.event.get():
+        if idle:
+            events = [pygame.event.wait(IDLE_WAIT_MS)] + pygame.event.get()
+            clock.tick()  # restart frame timing so the sleep isn't counted as a frame
+            dt = 1.0 / FPS
+        else:
+            # Cap dt at two frames: a stall (window drag, JIT, debugger) must not turn
+            # into one huge rotation that could jump across a hemisphere constraint.
+            dt = min(clock.tick(FPS) / 1000.0, 2.0 / FPS)
+            events = pygame.event.get()
+        prev_state = (u, hemisphere)
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
+            elif event.type == pygame.VIDEOEXPOSE:
+                dirty = full_redraw = True
+
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                # KEYUPs are not delivered to an unfocused window
+                held = dict.fromkeys(held, False)
+
+            elif event.type == pygame.KEYUP:
+                if event.key in held:
+                    held[event.key] = False
+
             elif event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_ESCAPE, pygame.K_q):
                     running = False
 
+                elif event.key in held:
+                    held[event.key] = True
+
                 elif event.key == pygame.K_r:
-                    theta, phi = math.pi/2, 0.0
+                    u, east = (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)
 
                 elif event.key == pygame.K_0:
                     hemisphere = None
@@ -217,44 +385,82 @@ def main():
                     hemisphere = '+Z'
                 elif event.key == pygame.K_6:
                     hemisphere = '-Z'
+                hemi_key = HEMI[hemisphere]
 
-        # Key hold movement
-        keys = pygame.key.get_pressed()
-        fine = keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]
-        step = STEP_FINE if fine else STEP_COARSE
+        # Key hold movement, frame-rate independent
+        fine = held[pygame.K_LSHIFT] or held[pygame.K_RSHIFT]
+        step = (STEP_FINE if fine else STEP_COARSE) * dt * FPS
 
         dtheta = 0.0
         dphi = 0.0
-        if keys[pygame.K_LEFT]:
+        if held[pygame.K_LEFT]:
             dphi -= step
-        if keys[pygame.K_RIGHT]:
+        if held[pygame.K_RIGHT]:
             dphi += step
-        if keys[pygame.K_UP]:
+        if held[pygame.K_UP]:
             dtheta -= step
-        if keys[pygame.K_DOWN]:
+        if held[pygame.K_DOWN]:
             dtheta += step
 
-        if dtheta != 0.0 or dphi != 0.0:
-            theta, phi = try_move(theta, phi, dtheta, dphi, hemisphere)
+        moving = dtheta != 0.0 or dphi != 0.0
+        if moving:
+            u, east = try_move(u, east, dtheta, dphi, hemi_key)
+        idle = not moving
 
-        # Compute current point on unit sphere, then scale to RADIUS for drawing
-        ux, uy, uz = sph_to_cart(theta, phi, 1.0)
+        if (u, hemisphere) != prev_state:
+            dirty = True
+        if not dirty:
+            # Nothing changed: the last flipped frame is still on screen
+            continue
+
+        # Scale the unit direction to RADIUS for drawing; angles are only for the HUD
+        ux, uy, uz = u
         px, py, pz = ux*RADIUS, uy*RADIUS, uz*RADIUS
+        theta = math.acos(max(-1.0, min(1.0, uz)))   # [0, pi]
+        phi = math.atan2(uy, ux)                     # (-pi, pi]
 
         # Draw
-        screen.fill(BG_COLOR)
-        draw_wire_sphere(screen, cx, cy)
-        draw_axes(screen, cx, cy)
-        draw_point_and_radius(screen, cx, cy, (px, py, pz))
+        if full_redraw:
+            screen.blit(bg_surf, (0, 0))
+        elif point_rect:
+            screen.blit(bg_surf, point_rect, point_rect)
+        old_rect = point_rect
+        point_rect = draw_point_and_radius(screen, cx, cy, (px, py, pz))
 
         # HUD
-        text(screen, big, "Sphere Navigator", 16, 16)
-        text(screen, font, "Arrows: move on surface   Shift: fine step   R: reset   0: free   1..6: hemisphere (+X,-X,+Y,-Y,+Z,-Z)   Esc/Q: quit", 16, 48)
-        text(screen, font, f"Hemisphere: {hemisphere or 'None'}", 16, 72)
-        text(screen, font, f"Unit direction: {format_vec((ux, uy, uz))}", 16, 96)
-        text(screen, font, f"Theta (deg): {math.degrees(theta):.2f}   Phi (deg): {math.degrees(phi):.2f}", 16, 120)
-
-        pygame.display.flip()
+        # Quantize to the displayed precision so the layer is only recomposed
+        # when the readout visibly changes
+        u_disp = (round(ux, 3), round(uy, 3), round(uz, 3))
+        theta_disp = round(math.degrees(theta), 2)
+        phi_disp = round(math.degrees(phi), 2)
+        state = (hemisphere, u_disp, theta_disp, phi_disp)
+        hud_changed = state != hud_state
+        if hud_changed:
+            hud_state = state
+            hud_surf.fill((0, 0, 0, 0))
+            text(hud_surf, big, "Sphere Navigator", 16, 16)
+            text(hud_surf, font, "Arrows: move on surface   Shift: fine step   R: reset   0: free   1..6: hemisphere (+X,-X,+Y,-Y,+Z,-Z)   Esc/Q: quit", 16, 48)
+            text(hud_surf, font, f"Hemisphere: {hemisphere or 'None'}", 16, 72)
+            text(hud_surf, font, f"Unit direction: {format_vec(u_disp)}", 16, 96)
+            text(hud_surf, font, f"Theta (deg): {theta_disp:.2f}   Phi (deg): {phi_disp:.2f}", 16, 120)
+
+        # The HUD stays on top: repaint its area when the text changed or the
+        # old/new point touched it. The point is redrawn after the restore; it is
+        # opaque and unantialiased, so drawing it twice leaves the same pixels.
+        hud_hit = full_redraw or hud_changed or any(
+            r is not None and r.colliderect(hud_rect) for r in (old_rect, point_rect))
+        if hud_hit and not full_redraw:
+            screen.blit(bg_surf, hud_rect, hud_rect)
+            draw_point_and_radius(screen, cx, cy, (px, py, pz))
+        if hud_hit:
+            screen.blit(hud_surf, hud_rect)
+
+        if full_redraw:
+            pygame.display.flip()
+            full_redraw = False
+        else:
+            pygame.display.update([r for r in (old_rect, point_rect, hud_rect if hud_hit else None) if r])
+        dirty = False
 
     pygame.quit()
     sys.exit(0)